@@ -12,7 +12,7 @@ from pyramid.exceptions import (
 )
 from pyramid.interfaces import IActionInfo
 from pyramid.registry import undefer
-from pyramid.util import is_nonstr_iter, reraise
+from pyramid.util import is_nonstr_iter
 
 
 class ActionConfiguratorMixin:
@@ -308,11 +308,9 @@ class ActionState:
                 except Exception:
                     t, v, tb = sys.exc_info()
                     try:
-                        reraise(
-                            ConfigurationExecutionError,
-                            ConfigurationExecutionError(t, v, info),
-                            tb,
-                        )
+                        raise ConfigurationExecutionError(
+                            t, v, info
+                        ).with_traceback(tb)
                     finally:
                         del t, v, tb
 
@@ -1,6 +1,7 @@
 from hashlib import md5
 from webob.acceptparse import Accept
 
+from pyramid.config.actions import action_method
 from pyramid.exceptions import ConfigurationError
 from pyramid.interfaces import PHASE1_CONFIG, IPredicateList
 from pyramid.predicates import Notted
@@ -51,6 +52,13 @@ class PredicateConfiguratorMixin:
             order=PHASE1_CONFIG,
         )  # must be registered early
 
+    @action_method
+    def _add_predicates(self, type, predicates):
+        # register a sequence of ``(name, factory)`` pairs while computing
+        # the action info only once for the whole batch
+        for name, factory in predicates:
+            self._add_predicate(type, name, factory)
+
 
 class not_:
     """
@@ -1,4 +1,5 @@
 import contextlib
+import sys
 from urllib.parse import urlparse
 import warnings
 
@@ -16,6 +17,54 @@ from pyramid.request import route_request_iface
 from pyramid.urldispatch import RoutesMapper
 from pyramid.util import as_sorted_tuple, is_nonstr_iter
 
+_DEFAULT_ROUTE_PREDICATES = (
+    ('xhr', pyramid.predicates.XHRPredicate),
+    ('request_method', pyramid.predicates.RequestMethodPredicate),
+    ('path_info', pyramid.predicates.PathInfoPredicate),
+    ('request_param', pyramid.predicates.RequestParamPredicate),
+    ('header', pyramid.predicates.HeaderPredicate),
+    ('accept', pyramid.predicates.AcceptPredicate),
+    ('is_authenticated', pyramid.predicates.IsAuthenticatedPredicate),
+    ('effective_principals', pyramid.predicates.EffectivePrincipalsPredicate),
+    ('custom', pyramid.predicates.CustomPredicate),
+    ('traverse', pyramid.predicates.TraversePredicate),
+)
+
+
+class _ExternalURLPregenerator:
+    """Pregenerator used for external routes; it sets ``_app_url`` to the
+    scheme and host of the external URL before any user-supplied
+    pregenerator runs."""
+
+    __slots__ = ('netloc', 'pattern', 'orig', 'default_app_url')
+
+    def __init__(self, scheme, netloc, pattern, orig):
+        self.netloc = netloc
+        self.pattern = pattern
+        self.orig = orig
+        # computed once here rather than per generated URL
+        self.default_app_url = f'{scheme}://{netloc}' if scheme else None
+
+    def __call__(self, request, elements, kw):
+        if '_app_url' in kw:
+            raise ValueError(
+                'You cannot generate a path to an external route '
+                'pattern via request.route_path nor pass an _app_url '
+                'to request.route_url when generating a URL for an '
+                'external route pattern (pattern was "%s") ' % (self.pattern,)
+            )
+        if '_scheme' in kw:
+            kw['_app_url'] = f'{kw["_scheme"]}://{self.netloc}'
+        elif self.default_app_url is not None:
+            kw['_app_url'] = self.default_app_url
+        else:
+            kw['_app_url'] = f'{request.scheme}://{self.netloc}'
+
+        orig = self.orig
+        if orig:
+            elements, kw = orig(request, elements, kw)
+        return elements, kw
+
 
 class RoutesConfiguratorMixin:
     @action_method
@@ -352,13 +401,20 @@ class RoutesConfiguratorMixin:
                 stacklevel=3,
             )
 
+        # route names are used as keys by every registry lookup of the
+        # route's request interface; interning them lets those lookups
+        # compare by identity
+        if name.__class__ is str:
+            name = sys.intern(name)
+
         if accept is not None:
-            if not is_nonstr_iter(accept):
-                accept = [accept]
-            accept = [
-                normalize_accept_offer(accept_option)
-                for accept_option in accept
-            ]
+            if isinstance(accept, str) or not is_nonstr_iter(accept):
+                accept = (normalize_accept_offer(accept),)
+            else:
+                accept = tuple(
+                    normalize_accept_offer(accept_option)
+                    for accept_option in accept
+                )
 
         # these are route predicates; if they do not match, the next route
         # in the routelist will be tried
@@ -377,46 +433,27 @@ class RoutesConfiguratorMixin:
             )
 
         # check for an external route; an external route is one which is
-        # is a full url (e.g. 'http://example.com/{id}')
-        parsed = urlparse(pattern)
+        # is a full url (e.g. 'http://example.com/{id}').  A url can only
+        # have a hostname if it contains '//', so most patterns never need
+        # to be parsed.
+        slashes = b'//' if isinstance(pattern, bytes) else '//'
+        parsed = urlparse(pattern) if slashes in pattern else None
         external_url = pattern
+        route_prefix = self.route_prefix
 
-        if parsed.hostname:
+        if parsed is not None and parsed.hostname:
             pattern = parsed.path
 
-            original_pregenerator = pregenerator
-
-            def external_url_pregenerator(request, elements, kw):
-                if '_app_url' in kw:
-                    raise ValueError(
-                        'You cannot generate a path to an external route '
-                        'pattern via request.route_path nor pass an _app_url '
-                        'to request.route_url when generating a URL for an '
-                        'external route pattern (pattern was "%s") '
-                        % (pattern,)
-                    )
-                if '_scheme' in kw:
-                    scheme = kw['_scheme']
-                elif parsed.scheme:
-                    scheme = parsed.scheme
-                else:
-                    scheme = request.scheme
-                kw['_app_url'] = f'{scheme}://{parsed.netloc}'
-
-                if original_pregenerator:
-                    elements, kw = original_pregenerator(request, elements, kw)
-                return elements, kw
-
-            pregenerator = external_url_pregenerator
+            pregenerator = _ExternalURLPregenerator(
+                parsed.scheme, parsed.netloc, pattern, pregenerator
+            )
             static = True
 
-        elif self.route_prefix:
+        elif route_prefix:
             if pattern == '' and inherit_slash:
-                pattern = self.route_prefix
+                pattern = route_prefix
             else:
-                pattern = (
-                    self.route_prefix.rstrip('/') + '/' + pattern.lstrip('/')
-                )
+                pattern = f"{route_prefix.rstrip('/')}/{pattern.lstrip('/')}"
 
         mapper = self.get_routes_mapper()
 
@@ -425,20 +462,24 @@ class RoutesConfiguratorMixin:
         intr = self.introspectable(
             'routes', name, f'{name} (pattern: {pattern!r})', 'route'
         )
-        intr['name'] = name
-        intr['pattern'] = pattern
-        intr['factory'] = factory
-        intr['xhr'] = xhr
-        intr['request_methods'] = request_method
-        intr['path_info'] = path_info
-        intr['request_param'] = request_param
-        intr['header'] = header
-        intr['accept'] = accept
-        intr['traverse'] = traverse
-        intr['custom_predicates'] = custom_predicates
-        intr['pregenerator'] = pregenerator
-        intr['static'] = static
-        intr['use_global_views'] = use_global_views
+        intr.update(
+            {
+                'name': name,
+                'pattern': pattern,
+                'factory': factory,
+                'xhr': xhr,
+                'request_methods': request_method,
+                'path_info': path_info,
+                'request_param': request_param,
+                'header': header,
+                'accept': accept,
+                'traverse': traverse,
+                'custom_predicates': custom_predicates,
+                'pregenerator': pregenerator,
+                'static': static,
+                'use_global_views': use_global_views,
+            }
+        )
 
         if static is True:
             intr['external_url'] = external_url
@@ -472,19 +513,17 @@ class RoutesConfiguratorMixin:
                 )
 
         def register_connect():
-            pvals = predicates.copy()
-            pvals.update(
-                dict(
-                    xhr=xhr,
-                    request_method=request_method,
-                    path_info=path_info,
-                    request_param=request_param,
-                    header=header,
-                    accept=accept,
-                    traverse=traverse,
-                    custom=predvalseq(custom_predicates),
-                )
-            )
+            pvals = {
+                **predicates,
+                'xhr': xhr,
+                'request_method': request_method,
+                'path_info': path_info,
+                'request_param': request_param,
+                'header': header,
+                'accept': accept,
+                'traverse': traverse,
+                'custom': predvalseq(custom_predicates),
+            }
 
             predlist = self.get_predlist('route')
             _, preds, _ = predlist.make(self, **pvals)
@@ -541,20 +580,7 @@ class RoutesConfiguratorMixin:
         )
 
     def add_default_route_predicates(self):
-        p = pyramid.predicates
-        for (name, factory) in (
-            ('xhr', p.XHRPredicate),
-            ('request_method', p.RequestMethodPredicate),
-            ('path_info', p.PathInfoPredicate),
-            ('request_param', p.RequestParamPredicate),
-            ('header', p.HeaderPredicate),
-            ('accept', p.AcceptPredicate),
-            ('is_authenticated', p.IsAuthenticatedPredicate),
-            ('effective_principals', p.EffectivePrincipalsPredicate),
-            ('custom', p.CustomPredicate),
-            ('traverse', p.TraversePredicate),
-        ):
-            self.add_route_predicate(name, factory)
+        self._add_predicates('route', _DEFAULT_ROUTE_PREDICATES)
 
     def get_routes_mapper(self):
         """Return the :term:`routes mapper` object associated with
@@ -588,21 +614,12 @@ class RoutesConfiguratorMixin:
         """
         original_route_prefix = self.route_prefix
 
-        if route_prefix is None:
-            route_prefix = ''
-
-        old_route_prefix = self.route_prefix
-        if old_route_prefix is None:
-            old_route_prefix = ''
-
-        route_prefix = '{}/{}'.format(
-            old_route_prefix.rstrip('/'), route_prefix.lstrip('/')
-        )
-
-        route_prefix = route_prefix.strip('/')
-
-        if not route_prefix:
-            route_prefix = None
+        parts = []
+        if original_route_prefix:
+            parts.append(original_route_prefix.strip('/'))
+        if route_prefix:
+            parts.append(route_prefix.strip('/'))
+        route_prefix = '/'.join(p for p in parts if p) or None
 
         self.begin()
         try:
@@ -1,3 +1,4 @@
+from operator import itemgetter
 import re
 from zope.interface import implementer
 
@@ -8,6 +9,10 @@ from pyramid.util import is_nonstr_iter, text_
 
 _marker = object()
 
+# with this many non-static routes or fewer, trying every route in turn is
+# at least as fast as looking up candidates in the prefix trie
+_SCAN_LIMIT = 10
+
 
 @implementer(IRoute)
 class Route:
@@ -23,6 +28,97 @@ class Route:
         self.pregenerator = pregenerator
 
 
+class _PrefixTrieNode:
+    __slots__ = ('prefix', 'children', 'values', 'ordered', 'candidates')
+
+    def __init__(self, prefix, ordered=()):
+        self.prefix = prefix
+        self.children = {}
+        # (order, value) pairs stored at this node
+        self.values = []
+        # the (order, value) pairs of this node and all of its ancestors,
+        # sorted by order, and just their values as returned by lookup
+        self.ordered = ordered
+        self.candidates = tuple(value for _, value in ordered)
+
+
+class PrefixTrie:
+    """A compressed prefix tree (radix tree) mapping the static leading
+    portion of route patterns to the routes which share it.
+
+    Each node holds a shared prefix string rather than a single character,
+    so a lookup descends at most one node per distinct static prefix.
+    Values are inserted with a unique ``order`` and every node keeps the
+    values of itself and its ancestors sorted by it, so :meth:`lookup` only
+    has to find the deepest node matching a path."""
+
+    def __init__(self):
+        self.root = _PrefixTrieNode('')
+
+    def insert(self, key, order, value):
+        node = parent = self.root
+        while key:
+            child = node.children.get(key[0])
+            if child is None:
+                child = _PrefixTrieNode(key, node.ordered)
+                node.children[key[0]] = child
+                parent, node = node, child
+                break
+            label = child.prefix
+            limit = min(len(label), len(key))
+            common = 1
+            while common < limit and label[common] == key[common]:
+                common += 1
+            if common < len(label):
+                # split the edge so that the shared part becomes its own node
+                split = _PrefixTrieNode(label[:common], node.ordered)
+                child.prefix = label[common:]
+                split.children[child.prefix[0]] = child
+                node.children[key[0]] = split
+                child = split
+            parent, node = node, child
+            key = key[common:]
+        node.values.append((order, value))
+        self._refresh(node, () if node is parent else parent.ordered)
+
+    def remove(self, key, value):
+        node = parent = self.root
+        while key:
+            parent, node = node, node.children.get(key[0])
+            if node is None or not key.startswith(node.prefix):
+                return
+            key = key[len(node.prefix) :]
+        node.values[:] = [v for v in node.values if v[1] is not value]
+        self._refresh(node, () if node is parent else parent.ordered)
+
+    def _refresh(self, node, inherited):
+        # recompute the candidates of ``node`` and of everything below it
+        # after the values stored at ``node`` changed; ``inherited`` holds
+        # the ordered pairs of its parent
+        stack = [(node, list(inherited))]
+        while stack:
+            node, inherited = stack.pop()
+            ordered = sorted(inherited + node.values, key=itemgetter(0))
+            node.ordered = ordered
+            node.candidates = tuple(value for _, value in ordered)
+            for child in node.children.values():
+                stack.append((child, ordered))
+
+    def lookup(self, path):
+        """Return every value whose key is a prefix of ``path``, in
+        insertion order."""
+        node = self.root
+        pos = 0
+        end = len(path)
+        while pos < end:
+            child = node.children.get(path[pos])
+            if child is None or not path.startswith(child.prefix, pos):
+                break
+            node = child
+            pos += len(child.prefix)
+        return node.candidates
+
+
 @implementer(IRoutesMapper)
 class RoutesMapper:
     def __init__(self):
@@ -31,6 +127,14 @@ class RoutesMapper:
 
         self.routes = {}
 
+        # non-static routes indexed by the static prefix of their pattern;
+        # see ``__call__``
+        self.trie = PrefixTrie()
+        self._order = 0
+        # every non-static route in order while there are few enough of them
+        # to be scanned without the trie; otherwise None
+        self._scan = ()
+
     def has_routes(self):
         return bool(self.routelist)
 
@@ -56,12 +160,19 @@ class RoutesMapper:
             oldroute = self.routes[name]
             if oldroute in self.routelist:
                 self.routelist.remove(oldroute)
+                self.trie.remove(_static_prefix(oldroute.pattern), oldroute)
 
         route = Route(name, pattern, factory, predicates, pregenerator)
         if not static:
             self.routelist.append(route)
+            self.trie.insert(_static_prefix(pattern), self._order, route)
+            self._order += 1
         else:
             self.static_routes.append(route)
+        routelist = self.routelist
+        self._scan = (
+            tuple(routelist) if len(routelist) <= _SCAN_LIMIT else None
+        )
 
         self.routes[name] = route
         return route
@@ -80,7 +191,12 @@ class RoutesMapper:
                 e.encoding, e.object, e.start, e.end, e.reason
             )
 
-        for route in self.routelist:
+        routes = self._scan
+        if routes is None:
+            # only routes whose static prefix matches the path can possibly
+            # match it; they are returned in the same order as ``routelist``
+            routes = self.trie.lookup(path)
+        for route in routes:
             match = route.match(path)
             if match is not None:
                 preds = route.predicates
@@ -108,7 +224,7 @@ def update_pattern(matchobj):
     return '{%s}' % name[1:]
 
 
-def _compile_route(route):
+def _normalize_route(route):
     # This function really wants to consume Unicode patterns natively, but if
     # someone passes us a bytestring, we allow it by converting it to Unicode
     # using the ASCII decoding.  We decode it using ASCII because we don't
@@ -130,6 +246,21 @@ def _compile_route(route):
     if not route.startswith('/'):
         route = '/' + route
 
+    return route
+
+
+def _static_prefix(route):
+    """Return the literal leading portion of a route pattern which every
+    path matched by the route must start with."""
+    route = _normalize_route(route)
+    if star_at_end.search(route):
+        route = route.rsplit('*', 1)[0]
+    return route_re.split(route, 1)[0]
+
+
+def _compile_route(route):
+    route = _normalize_route(route)
+
     remainder = None
     if star_at_end.search(route):
         route, remainder = route.rsplit('*', 1)
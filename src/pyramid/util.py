@@ -1,23 +1,19 @@
+from collections import OrderedDict, deque
 from contextlib import contextmanager
 import functools
 from hmac import compare_digest
 import inspect
-import platform
+import sys
 import weakref
 
+from pyramid.decorator import reify
 from pyramid.path import DottedNameResolver as _DottedNameResolver
 
 _marker = object()
 
-WIN = platform.system() == 'Windows'
+WIN = sys.platform == 'win32'
 
-try:  # pragma: no cover
-    import __pypy__
-
-    PYPY = True
-except BaseException:  # pragma: no cover
-    __pypy__ = None
-    PYPY = False
+PYPY = sys.implementation.name == 'pypy'
 
 
 class DottedNameResolver(_DottedNameResolver):
@@ -48,37 +44,70 @@ def ascii_(s):
     If ``s`` is an instance of ``str``, return
     ``s.encode('ascii')``, otherwise return ``str(s, 'ascii', 'strict')``
     """
+    cls = s.__class__
+    if cls is str:
+        if s.isascii():
+            # encoding and decoding again would produce an equal string
+            return s
+    elif cls is bytes:
+        return s.decode('ascii', 'strict')
     if isinstance(s, str):
         s = s.encode('ascii')
     return str(s, 'ascii', 'strict')
 
 
 def is_nonstr_iter(v):
-    if isinstance(v, str):
+    # like iter() itself, look for __iter__ on the type rather than on the
+    # instance
+    t = v.__class__
+    if t is str or issubclass(t, str):
         return False
-    return hasattr(v, '__iter__')
+    return getattr(t, '__iter__', None) is not None
 
 
 def is_string_or_iterable(v):
-    if isinstance(v, str):
-        return True
-    if hasattr(v, '__iter__'):
+    t = v.__class__
+    if t is str or issubclass(t, str):
         return True
+    return getattr(t, '__iter__', None) is not None
 
 
 def as_sorted_tuple(val):
     if not is_nonstr_iter(val):
-        val = (val,)
-    val = tuple(sorted(val))
-    return val
+        return (val,)
+    val = tuple(val)
+    # predicate values almost always have fewer than four items; sort those
+    # with adjacent compare-and-swaps, which like sorted() only use "<" and
+    # keep equal items in their original order
+    n = len(val)
+    if n < 2:
+        return val
+    if n == 2:
+        a, b = val
+        return (b, a) if b < a else val
+    if n == 3:
+        a, b, c = val
+        if b < a:
+            a, b = b, a
+        if c < b:
+            b, c = c, b
+            if b < a:
+                a, b = b, a
+        return (a, b, c)
+    return tuple(sorted(val))
 
 
 class SettableProperty:
     # this is just like reify but does not store the computed result on
     # the class such that subsequent invocations invoke the callable again
+    __slots__ = ('wrapped', '__doc__', '__wrapped__')
+
     def __init__(self, wrapped):
         self.wrapped = wrapped
-        functools.update_wrapper(self, wrapped)
+        # only what help() and inspect.unwrap need; functools.update_wrapper
+        # would also merge the callable's __dict__ into ours
+        self.__doc__ = getattr(wrapped, '__doc__', None)
+        self.__wrapped__ = wrapped
 
     def __get__(self, obj, type=None):
         if obj is None:  # pragma: no cover
@@ -86,6 +115,23 @@ class SettableProperty:
         return self.wrapped(obj)
 
 
+class InstanceDictReify(reify):
+    # this is just like reify but stores the computed result directly in
+    # the instance's __dict__ (as functools.cached_property does) instead of
+    # going through setattr; subsequent lookups are then plain instance
+    # attribute hits which never reach the descriptor
+    def __init__(self, wrapped, name=None):
+        self.wrapped = wrapped
+        self.__name__ = wrapped.__name__ if name is None else name
+        self.__doc__ = wrapped.__doc__
+
+    def __get__(self, inst, objtype=None):
+        if inst is None:
+            return self
+        val = inst.__dict__[self.__name__] = self.wrapped(inst)
+        return val
+
+
 class InstancePropertyHelper:
     """A helper object for assigning properties and descriptors to instances.
     It is not normally possible to do this because descriptors must be
@@ -97,6 +143,11 @@ class InstancePropertyHelper:
 
     """
 
+    # subclasses synthesized by apply_properties, keyed on the parent class
+    # and the name and identity of every property; the cached class keeps
+    # the properties alive, so their ids cannot be reused while it exists
+    _class_cache = weakref.WeakValueDictionary()
+
     def __init__(self):
         self.properties = {}
 
@@ -113,23 +164,19 @@ class InstancePropertyHelper:
                     'missing __name__, must specify "name" for property'
                 )
             name = callable.__name__
-        name = get_callable_name(name)
+        if name.__class__ is not str or not name.isascii():
+            name = get_callable_name(name)
         is_data_descriptor = inspect.isdatadescriptor(callable)
         if reify and is_data_descriptor:
             raise ValueError('cannot reify a data descriptor')
+        # the callable is used directly rather than through a wrapper
+        # function so that each access costs one less Python frame
         if is_data_descriptor:
             fn = callable
+        elif reify:
+            fn = InstanceDictReify(callable, name)
         else:
-            wrapped = lambda this: callable(this)
-            wrapped.__name__ = name
-            wrapped.__doc__ = callable.__doc__
-
-            if reify:
-                import pyramid.decorator  # avoid circular import
-
-                fn = pyramid.decorator.reify(wrapped)
-            else:
-                fn = SettableProperty(wrapped)
+            fn = SettableProperty(callable)
 
         return name, fn
 
@@ -138,34 +185,50 @@ class InstancePropertyHelper:
         """Accept a list or dict of ``properties`` generated from
         :meth:`.make_property` and apply them to a ``target`` object.
         """
-        attrs = dict(properties)
-        if attrs:
+        if not isinstance(properties, dict):
+            properties = dict(properties)
+        if properties:
             parent = target.__class__
-            # fix the module name so it appears to still be the parent
-            # e.g. pyramid.request instead of pyramid.util
-            attrs.setdefault('__module__', parent.__module__)
-            newcls = type(parent.__name__, (parent, object), attrs)
-            # We assign __provides__ and __implemented__ below to prevent a
-            # memory leak that results from from the usage of this instance's
-            # eventual use in an adapter lookup.  Adapter lookup results in
-            # ``zope.interface.implementedBy`` being called with the
-            # newly-created class as an argument.  Because the newly-created
-            # class has no interface specification data of its own, lookup
-            # causes new ClassProvides and Implements instances related to our
-            # just-generated class to be created and set into the newly-created
-            # class' __dict__.  We don't want these instances to be created; we
-            # want this new class to behave exactly like it is the parent class
-            # instead.  See GitHub issues #1212, #1529 and #1568 for more
-            # information.
-            for name in ('__implemented__', '__provides__'):
-                # we assign these attributes conditionally to make it possible
-                # to test this class in isolation without having any interfaces
-                # attached to it
-                val = getattr(parent, name, _marker)
-                if val is not _marker:
-                    setattr(newcls, name, val)
+            key = (
+                parent,
+                tuple(
+                    sorted((name, id(fn)) for name, fn in properties.items())
+                ),
+            )
+            newcls = cls._class_cache.get(key)
+            if newcls is None:
+                # copied only on a miss, as _make_class adds __module__
+                newcls = cls._make_class(parent, dict(properties))
+                cls._class_cache[key] = newcls
             target.__class__ = newcls
 
+    @classmethod
+    def _make_class(cls, parent, attrs):
+        # fix the module name so it appears to still be the parent
+        # e.g. pyramid.request instead of pyramid.util
+        attrs.setdefault('__module__', parent.__module__)
+        newcls = type(parent.__name__, (parent, object), attrs)
+        # We assign __provides__ and __implemented__ below to prevent a
+        # memory leak that results from from the usage of this instance's
+        # eventual use in an adapter lookup.  Adapter lookup results in
+        # ``zope.interface.implementedBy`` being called with the
+        # newly-created class as an argument.  Because the newly-created
+        # class has no interface specification data of its own, lookup
+        # causes new ClassProvides and Implements instances related to our
+        # just-generated class to be created and set into the newly-created
+        # class' __dict__.  We don't want these instances to be created; we
+        # want this new class to behave exactly like it is the parent class
+        # instead.  See GitHub issues #1212, #1529 and #1568 for more
+        # information.
+        for name in ('__implemented__', '__provides__'):
+            # we assign these attributes conditionally to make it possible
+            # to test this class in isolation without having any interfaces
+            # attached to it
+            val = getattr(parent, name, _marker)
+            if val is not _marker:
+                setattr(newcls, name, val)
+        return newcls
+
     @classmethod
     def set_property(cls, target, callable, name=None, reify=False):
         """A helper method to apply a single property to an instance."""
@@ -270,26 +333,31 @@ class WeakOrderedSet:
         order.last == '1'
     """
 
+    __slots__ = ('_order', '_remove_ref', '__weakref__')
+
     def __init__(self):
-        self._items = {}
-        self._order = []
+        # maps the id of each item to a weakref to it, in the order the
+        # items were (most recently) added
+        self._order = OrderedDict()
+
+        # shared by the weakrefs of all items; it only references the
+        # dict, not self, and finds the item to drop by the weakref's key
+        def _remove_ref(ref, pop=self._order.pop):
+            pop(ref.key, None)
+
+        self._remove_ref = _remove_ref
 
     def add(self, item):
         """Add an item to the set."""
         oid = id(item)
-        if oid in self._items:
-            self._order.remove(oid)
-            self._order.append(oid)
+        if oid in self._order:
+            self._order.move_to_end(oid)
             return
-        ref = weakref.ref(item, lambda x: self._remove_by_id(oid))
-        self._items[oid] = ref
-        self._order.append(oid)
+        self._order[oid] = weakref.KeyedRef(item, self._remove_ref, oid)
 
     def _remove_by_id(self, oid):
         """Remove an item from the set."""
-        if oid in self._items:
-            del self._items[oid]
-            self._order.remove(oid)
+        self._order.pop(oid, None)
 
     def remove(self, item):
         """Remove an item from the set."""
@@ -297,24 +365,22 @@ class WeakOrderedSet:
 
     def empty(self):
         """Clear all objects from the set."""
-        self._items = {}
-        self._order = []
+        self._order.clear()
 
     def __len__(self):
         return len(self._order)
 
     def __contains__(self, item):
         oid = id(item)
-        return oid in self._items
+        return oid in self._order
 
     def __iter__(self):
-        return (self._items[oid]() for oid in self._order)
+        return (ref() for ref in self._order.values())
 
     @property
     def last(self):
         if self._order:
-            oid = self._order[-1]
-            return self._items[oid]()
+            return next(reversed(self._order.values()))()
 
 
 def strings_differ(string1, string2):
@@ -331,18 +397,11 @@ def strings_differ(string1, string2):
        Support :func:`hmac.compare_digest` if it is available (Python 2.7.7+
        and Python 3.3+).
 
-    """
-    len_eq = len(string1) == len(string2)
-    if len_eq:
-        invalid_bits = 0
-        left = string1
-    else:
-        invalid_bits = 1
-        left = string2
-    right = string2
+    The comparison, including the handling of strings of different
+    lengths, is done entirely by :func:`hmac.compare_digest`.
 
-    invalid_bits += not compare_digest(left, right)
-    return invalid_bits != 0
+    """
+    return not compare_digest(string1, string2)
 
 
 def object_description(object):
@@ -411,6 +470,8 @@ def shortrepr(object, closer):
 
 
 class Sentinel:
+    __slots__ = ('repr',)
+
     def __init__(self, repr):
         self.repr = repr
 
@@ -426,6 +487,21 @@ class TopologicalSorter:
     """A utility class which can be used to perform topological sorts against
     tuple-like data."""
 
+    __slots__ = (
+        'names',
+        'req_before',
+        'req_after',
+        'name2before',
+        'name2after',
+        'name2val',
+        'order',
+        'default_before',
+        'default_after',
+        'first',
+        'last',
+        '_sorted',
+    )
+
     def __init__(
         self, default_before=LAST, default_after=None, first=FIRST, last=LAST
     ):
@@ -440,12 +516,15 @@ class TopologicalSorter:
         self.default_after = default_after
         self.first = first
         self.last = last
+        # the result of the last call to sorted(); reset by add and remove
+        self._sorted = None
 
     def values(self):
         return self.name2val.values()
 
     def remove(self, name):
         """Remove a node from the sort input"""
+        self._sorted = None
         self.names.remove(name)
         del self.name2val[name]
         after = self.name2after.pop(name, [])
@@ -478,6 +557,7 @@ class TopologicalSorter:
            sorter.sorted() # will be {'c':3}, {'b':2}, {'a':1}
 
         """
+        self._sorted = None
         if name in self.names:
             self.remove(name)
         self.names.append(name)
@@ -500,33 +580,27 @@ class TopologicalSorter:
 
     def sorted(self):
         """Returns the sort input values in topologically sorted order"""
-        order = [(self.first, self.last)]
-        roots = []
-        graph = {}
+        # predicate lists and view derivers are sorted once for every view,
+        # route and subscriber that is registered, while the input rarely
+        # changes in between
+        if self._sorted is None:
+            self._sorted = self._sort()
+        return list(self._sorted)
+
+    def _sort(self):
         names = [self.first, self.last]
         names.extend(self.names)
 
-        for a, b in self.order:
-            order.append((a, b))
-
-        def add_node(node):
-            if node not in graph:
-                roots.append(node)
-                graph[node] = [0]  # 0 = number of arcs coming into this node
-
-        def add_arc(fromnode, tonode):
-            graph[fromnode].append(tonode)
-            graph[tonode][0] += 1
-            if tonode in roots:
-                roots.remove(tonode)
-
-        for name in names:
-            add_node(name)
+        # number of arcs coming into each node and the nodes each one
+        # points to
+        indegree = dict.fromkeys(names, 0)
+        children = {name: [] for name in names}
 
         has_before, has_after = set(), set()
-        for a, b in order:
-            if a in names and b in names:  # deal with missing dependencies
-                add_arc(a, b)
+        for a, b in ((self.first, self.last), *self.order):
+            if a in indegree and b in indegree:  # deal with missing deps
+                children[a].append(b)
+                indegree[b] += 1
                 has_before.add(a)
                 has_after.add(b)
 
@@ -549,35 +623,33 @@ class TopologicalSorter:
 
         sorted_names = []
 
+        roots = deque(name for name in indegree if not indegree[name])
         while roots:
-            root = roots.pop(0)
+            root = roots.popleft()
             sorted_names.append(root)
-            children = graph[root][1:]
-            for child in children:
-                arcs = graph[child][0]
-                arcs -= 1
-                graph[child][0] = arcs
-                if arcs == 0:
-                    roots.insert(0, child)
-            del graph[root]
-
-        if graph:
+            for child in children[root]:
+                indegree[child] -= 1
+                if not indegree[child]:
+                    # visit newly freed nodes first
+                    roots.appendleft(child)
+
+        if len(sorted_names) < len(indegree):
             # avoid circular dependency
             from pyramid.exceptions import CyclicDependencyError
 
             # loop in input
-            cycledeps = {}
-            for k, v in graph.items():
-                cycledeps[k] = v[1:]
+            visited = set(sorted_names)
+            cycledeps = {
+                name: children[name]
+                for name in indegree
+                if name not in visited
+            }
             raise CyclicDependencyError(cycledeps)
 
-        result = []
-
-        for name in sorted_names:
-            if name in self.names:
-                result.append((name, self.name2val[name]))
-
-        return result
+        name2val = self.name2val
+        return [
+            (name, name2val[name]) for name in sorted_names if name in name2val
+        ]
 
 
 def get_callable_name(name):
@@ -585,6 +657,8 @@ def get_callable_name(name):
     Verifies that the ``name`` is ascii and will raise a ``ConfigurationError``
     if it is not.
     """
+    if name.__class__ is str and name.isascii():
+        return name
     try:
         return ascii_(name)
     except (UnicodeEncodeError, UnicodeDecodeError):
@@ -604,18 +678,30 @@ def hide_attrs(obj, *attrs):
     Temporarily delete object attrs and restore afterward.
     """
     obj_vals = obj.__dict__ if obj is not None else {}
-    saved_vals = {}
+    if len(attrs) == 1:
+        # render() and render_to_response() hide only request.response
+        name = attrs[0]
+        saved_val = obj_vals.pop(name, _marker)
+        try:
+            yield
+        finally:
+            if saved_val is not _marker:
+                obj_vals[name] = saved_val
+            else:
+                obj_vals.pop(name, None)
+        return
+    saved_vals = []
     for name in attrs:
-        saved_vals[name] = obj_vals.pop(name, _marker)
+        saved_vals.append((name, obj_vals.pop(name, _marker)))
     try:
         yield
     finally:
-        for name in attrs:
-            saved_val = saved_vals[name]
+        for name, saved_val in saved_vals:
             if saved_val is not _marker:
                 obj_vals[name] = saved_val
-            elif name in obj_vals:
-                del obj_vals[name]
+            else:
+                # drop any value assigned while the attribute was hidden
+                obj_vals.pop(name, None)
 
 
 def is_same_domain(host, pattern):
@@ -626,15 +712,25 @@ def is_same_domain(host, pattern):
     subdomains. (e.g. ``.example.com`` matches ``example.com`` and
     ``foo.example.com``). Anything else is an exact string match.
     """
+    return compile_domain_pattern(pattern)(host)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_domain_pattern(pattern):
+    """
+    Return a callable which accepts a host and returns ``True`` if it
+    matches ``pattern`` according to the rules of :func:`is_same_domain`.
+    The pattern is normalized only once, and the result is cached for
+    the most recently used patterns.
+    """
     if not pattern:
-        return False
+        return lambda host: False
 
     pattern = pattern.lower()
-    return (
-        pattern[0] == "."
-        and (host.endswith(pattern) or host == pattern[1:])
-        or pattern == host
-    )
+    if pattern[0] == ".":
+        bare = pattern[1:]
+        return lambda host: host.endswith(pattern) or host == bare
+    return lambda host: host == pattern
 
 
 def make_contextmanager(fn):
@@ -652,6 +748,29 @@ def make_contextmanager(fn):
     return wrapper
 
 
+# argspecs of the callables inspected by takes_one_arg and
+# is_unbound_method, which are asked about the same views, tweens and
+# subscribers over and over during configuration
+_argspec_cache = weakref.WeakKeyDictionary()
+
+
+def _getfullargspec(fn):
+    if inspect.ismethod(fn):
+        # a bound method is a new object on every attribute access, but its
+        # argspec is that of the underlying function
+        fn = fn.__func__
+    try:
+        return _argspec_cache[fn]
+    except (KeyError, TypeError):  # TypeError: not weakly referenceable
+        pass
+    argspec = inspect.getfullargspec(fn)
+    try:
+        _argspec_cache[fn] = argspec
+    except TypeError:
+        pass
+    return argspec
+
+
 def takes_one_arg(callee, attr=None, argname=None):
     ismethod = False
     if attr is None:
@@ -667,7 +786,7 @@ def takes_one_arg(callee, attr=None, argname=None):
         except AttributeError:
             return False
 
-    argspec = inspect.getfullargspec(fn)
+    argspec = _getfullargspec(fn)
     args = argspec[0]
 
     if hasattr(fn, '__func__') or ismethod:
@@ -715,7 +834,7 @@ def is_unbound_method(fn):
     is_bound = is_bound_method(fn)
 
     if not is_bound and inspect.isroutine(fn):
-        spec = inspect.getfullargspec(fn)
+        spec = _getfullargspec(fn)
         has_self = len(spec.args) > 0 and spec.args[0] == 'self'
 
         if inspect.isfunction(fn) and has_self:
@@ -728,9 +847,9 @@ def reraise(tp, value, tb=None):
     try:
         if value is None:
             value = tp()
-        if value.__traceback__ is not tb:
-            raise value.with_traceback(tb)
-        raise value
+        raise value.with_traceback(tb)
     finally:
+        # the traceback being raised references this frame; drop the
+        # locals so the frame does not keep the exception alive in a cycle
         value = None
         tb = None
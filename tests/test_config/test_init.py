@@ -1379,6 +1379,43 @@ class TestConfigurator__add_predicate(unittest.TestCase):
             'route', 'testing', 'tests.test_config.test_init.DummyPredicate'
         )
 
+    def test_get_predlist_utility_replaced(self):
+        from pyramid.config.predicates import PredicateList
+        from pyramid.interfaces import IPredicateList
+
+        config = self._makeOne()
+        route = config.get_predlist('route')
+        view = config.get_predlist('view')
+        predlist = PredicateList()
+        config.registry.registerUtility(predlist, IPredicateList, name='route')
+        self.assertIs(config.get_predlist('route'), predlist)
+        self.assertIsNot(predlist, route)
+        self.assertIs(config.get_predlist('view'), view)
+
+    def test__add_predicates(self):
+        config = self._makeOne()
+        actions = []
+
+        def _fakeAction(
+            discriminator,
+            callable=None,
+            args=(),
+            kw=None,
+            order=0,
+            introspectables=(),
+            **extra,
+        ):
+            actions.append(discriminator)
+
+        config.action = _fakeAction
+        config._add_predicates(
+            'route',
+            (('one', DummyPredicate), ('two', DummyPredicate)),
+        )
+        self.assertEqual(
+            actions, [('route option', 'one'), ('route option', 'two')]
+        )
+
 
 class TestGlobalRegistriesIntegration(unittest.TestCase):
     def setUp(self):
@@ -44,6 +44,20 @@ class RoutesConfiguratorMixinTests(unittest.TestCase):
         result = config.get_routes_mapper()
         self.assertEqual(result, mapper)
 
+    def test_get_routes_mapper_utility_replaced(self):
+        from pyramid.interfaces import IRoutesMapper
+        from pyramid.urldispatch import RoutesMapper
+
+        config = self._makeOne(autocommit=True)
+        config.add_route('a', '/a')
+        old = config.get_routes_mapper()
+        mapper = RoutesMapper()
+        config.registry.registerUtility(mapper, IRoutesMapper)
+        config.add_route('b', '/b')
+        self.assertIs(config.get_routes_mapper(), mapper)
+        self.assertEqual([r.name for r in mapper.get_routes()], ['b'])
+        self.assertEqual([r.name for r in old.get_routes()], ['a'])
+
     def test_add_route_defaults(self):
         config = self._makeOne(autocommit=True)
         config.add_route('name', 'path')
@@ -55,6 +69,20 @@ class RoutesConfiguratorMixinTests(unittest.TestCase):
         config.add_route('name', 'path')
         self._assertRoute(config, 'name', 'root/path')
 
+    def test_route_prefix_context_strips_slashes(self):
+        config = self._makeOne(autocommit=True)
+        config.route_prefix = '/root/'
+        with config.route_prefix_context('/sub/'):
+            self.assertEqual(config.route_prefix, 'root/sub')
+            with config.route_prefix_context('//'):
+                self.assertEqual(config.route_prefix, 'root/sub')
+        self.assertEqual(config.route_prefix, '/root/')
+        with config.route_prefix_context(None):
+            self.assertEqual(config.route_prefix, 'root')
+        config.route_prefix = None
+        with config.route_prefix_context('/'):
+            self.assertEqual(config.route_prefix, None)
+
     def test_add_route_with_inherit_errors(self):
         from pyramid.exceptions import ConfigurationError
 
@@ -79,6 +107,35 @@ class RoutesConfiguratorMixinTests(unittest.TestCase):
         config.add_route('name', '/')
         self._assertRoute(config, 'name', 'root/')
 
+    def test_add_route_double_slash_not_external(self):
+        config = self._makeOne(autocommit=True)
+        config.route_prefix = 'root'
+        config.add_route('name', 'a//b')
+        route = self._assertRoute(config, 'name', 'root/a//b')
+        self.assertEqual(route.pregenerator, None)
+
+    def test_add_route_bytes_pattern(self):
+        config = self._makeOne(autocommit=True)
+        config.add_route('name', b'/foo/{x}')
+        route = self._assertRoute(config, 'name', b'/foo/{x}')
+        self.assertEqual(route.match('/foo/1'), {'x': '1'})
+
+    def test_add_route_bytes_external_pattern(self):
+        config = self._makeOne(autocommit=True)
+        config.add_route('name', b'http://example.com/{x}')
+        route = config.get_routes_mapper().get_route('name')
+        self.assertEqual(route.path, b'/{x}')
+        self.assertTrue(route.pregenerator is not None)
+
+    def test_add_route_name_interned(self):
+        import sys
+
+        config = self._makeOne(autocommit=True)
+        name = ''.join(['na', 'me'])
+        config.add_route(name, 'path')
+        route = self._assertRoute(config, 'name', 'path')
+        self.assertIs(route.name, sys.intern('name'))
+
     def test_add_route_discriminator(self):
         config = self._makeOne()
         config.add_route('name', 'path')
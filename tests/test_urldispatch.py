@@ -268,6 +268,70 @@ class RoutesMapperTests(unittest.TestCase):
         self.assertEqual(result['route'], mapper.routes['root'])
         self.assertEqual(result['match'], {})
 
+    def _fill(self, mapper):
+        # connect enough unrelated routes that matching uses the trie
+        from pyramid.urldispatch import _SCAN_LIMIT
+
+        for i in range(_SCAN_LIMIT):
+            mapper.connect('filler%d' % i, 'filler%d/{x}' % i)
+
+    def test___call__scans_few_routes(self):
+        from pyramid.urldispatch import _SCAN_LIMIT
+
+        mapper = self._makeOne()
+        mapper.connect('foo', 'archives/:action')
+        self.assertEqual(mapper._scan, (mapper.routes['foo'],))
+        self._fill(mapper)
+        self.assertEqual(len(mapper.routelist), _SCAN_LIMIT + 1)
+        self.assertIsNone(mapper._scan)
+        request = self._getRequest(path_info='/archives/action1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['foo'])
+
+    def test___call__prefix_order_preserved(self):
+        mapper = self._makeOne()
+        self._fill(mapper)
+        mapper.connect('any', '/{path:.*}')
+        mapper.connect('archives', 'archives/:action')
+        request = self._getRequest(path_info='/archives/action1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['any'])
+
+    def test___call__shared_prefixes(self):
+        mapper = self._makeOne()
+        self._fill(mapper)
+        mapper.connect('archive', 'archive/:action')
+        mapper.connect('archives', 'archives/:action')
+        mapper.connect('arch', 'arch')
+        request = self._getRequest(path_info='/archives/action1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['archives'])
+        request = self._getRequest(path_info='/arch')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['arch'])
+        request = self._getRequest(path_info='/archi')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+
+    def test___call__name_exists_old_route_not_matched(self):
+        mapper = self._makeOne()
+        self._fill(mapper)
+        mapper.connect('foo', 'archives/:action')
+        mapper.connect('foo', 'other/:action')
+        request = self._getRequest(path_info='/archives/action1')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+        request = self._getRequest(path_info='/other/action1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['foo'])
+
+    def test___call__static_route_not_matched(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', 'archives/:action', static=True)
+        request = self._getRequest(path_info='/archives/action1')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+
     def test_has_routes(self):
         mapper = self._makeOne()
         self.assertEqual(mapper.has_routes(), False)
@@ -306,6 +370,71 @@ class RoutesMapperTests(unittest.TestCase):
         self.assertEqual(mapper.generate('abc', {}), 123)
 
 
+class TestPrefixTrie(unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.urldispatch import PrefixTrie
+
+        return PrefixTrie()
+
+    def test_lookup_empty(self):
+        trie = self._makeOne()
+        self.assertEqual(trie.lookup('/foo'), ())
+
+    def test_lookup_returns_prefixes_in_insertion_order(self):
+        trie = self._makeOne()
+        trie.insert('/foo/bar', 0, 'a')
+        trie.insert('/', 1, 'b')
+        trie.insert('/foo/baz', 2, 'c')
+        trie.insert('/foo', 3, 'd')
+        self.assertEqual(trie.lookup('/foo/bar/1'), ('a', 'b', 'd'))
+        self.assertEqual(trie.lookup('/foo/baz'), ('b', 'c', 'd'))
+        self.assertEqual(trie.lookup('/fo'), ('b',))
+
+    def test_remove(self):
+        trie = self._makeOne()
+        trie.insert('/foo', 0, 'a')
+        trie.insert('/foo', 1, 'b')
+        trie.remove('/foo', 'a')
+        trie.remove('/missing', 'a')
+        self.assertEqual(trie.lookup('/foo'), ('b',))
+
+    def test_remove_updates_descendants(self):
+        trie = self._makeOne()
+        trie.insert('/foo', 0, 'a')
+        trie.insert('/foo/bar', 1, 'b')
+        trie.insert('/foo/baz', 2, 'c')
+        self.assertEqual(trie.lookup('/foo/bar'), ('a', 'b'))
+        trie.remove('/foo', 'a')
+        self.assertEqual(trie.lookup('/foo/bar'), ('b',))
+        self.assertEqual(trie.lookup('/foo/baz'), ('c',))
+        self.assertEqual(trie.lookup('/foo'), ())
+
+    def test_split_node_inherits_candidates(self):
+        trie = self._makeOne()
+        trie.insert('', 0, 'a')
+        trie.insert('/foo/bar', 1, 'b')
+        trie.insert('/foo/baz', 2, 'c')
+        self.assertEqual(trie.lookup('/foo/'), ('a',))
+        self.assertEqual(trie.lookup('/foo/baz/1'), ('a', 'c'))
+        trie.insert('', 3, 'd')
+        self.assertEqual(trie.lookup('/foo/bar'), ('a', 'b', 'd'))
+
+
+class TestStaticPrefix(unittest.TestCase):
+    def _callFUT(self, pattern):
+        from pyramid.urldispatch import _static_prefix
+
+        return _static_prefix(pattern)
+
+    def test_it(self):
+        self.assertEqual(self._callFUT(''), '/')
+        self.assertEqual(self._callFUT('foo/bar'), '/foo/bar')
+        self.assertEqual(self._callFUT('/foo/{bar}/baz'), '/foo/')
+        self.assertEqual(self._callFUT('/foo/:bar'), '/foo/')
+        self.assertEqual(self._callFUT('/foo/*traverse'), '/foo/')
+        self.assertEqual(self._callFUT('/foo{bar:\\d{4}}'), '/foo')
+
+
 class TestCompileRoute(unittest.TestCase):
     def _callFUT(self, pattern):
         from pyramid.urldispatch import _compile_route
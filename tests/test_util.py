@@ -115,6 +115,17 @@ class Test_InstancePropertyHelper(unittest.TestCase):
         del foo.x
         self.assertIsNone(foo.x)
 
+    def test_callable_with_reify_stored_in_instance_dict(self):
+        def worker(obj):
+            return obj.bar
+
+        foo = Dummy()
+        helper = self._getTargetClass()
+        helper.set_property(foo, worker, name='x', reify=True)
+        foo.bar = 1
+        self.assertEqual(1, foo.x)
+        self.assertEqual(foo.__dict__['x'], 1)
+
     def test_override_reify(self):
         def worker(obj):
             pass
@@ -154,6 +165,32 @@ class Test_InstancePropertyHelper(unittest.TestCase):
         self.assertEqual(name, 'x')
         self.assertTrue(isinstance(fn, reify))
 
+    def test_make_property_callable_instance(self):
+        class Worker:
+            def __init__(self):
+                self.wrapped = 'not the callable'
+
+            def __call__(self, obj):
+                return obj.bar
+
+        helper = self._getTargetClass()
+        foo = Dummy()
+        helper.set_property(foo, Worker(), name='x')
+        helper.set_property(foo, Worker(), name='y', reify=True)
+        foo.bar = 1
+        self.assertEqual(foo.x, 1)
+        self.assertEqual(foo.y, 1)
+
+    def test_make_property_reify_uses_name(self):
+        def worker(obj):
+            """doc"""
+
+        helper = self._getTargetClass()
+        name, fn = helper.make_property(worker, name='x', reify=True)
+        self.assertEqual(fn.__name__, 'x')
+        self.assertEqual(fn.__doc__, 'doc')
+        self.assertIs(fn.wrapped, worker)
+
     def test_apply_properties_with_iterable(self):
         foo = Dummy()
         helper = self._getTargetClass()
@@ -172,6 +209,16 @@ class Test_InstancePropertyHelper(unittest.TestCase):
         self.assertEqual(1, foo.x)
         self.assertEqual(2, foo.y)
 
+    def test_apply_properties_does_not_modify_dict(self):
+        foo = Dummy()
+        helper = self._getTargetClass()
+        x_name, x_fn = helper.make_property(lambda _: 1, name='x')
+        properties = {x_name: x_fn}
+        helper.apply_properties(foo, properties)
+        helper.apply_properties(Dummy(), properties)
+        self.assertEqual(properties, {x_name: x_fn})
+        self.assertEqual(foo.__class__.__module__, Dummy.__module__)
+
     def test_make_property_unicode(self):
         from pyramid.exceptions import ConfigurationError
 
@@ -208,6 +255,44 @@ class Test_InstancePropertyHelper(unittest.TestCase):
         self.assertEqual(foo.x, 1)
         self.assertEqual(bar.x, 2)
 
+    def test_apply_reuses_class(self):
+        helper = self._makeOne()
+        helper.add_property(lambda obj: 1, name='x')
+        foo, bar = Dummy(), Dummy()
+        helper.apply(foo)
+        helper.apply(bar)
+        self.assertIs(foo.__class__, bar.__class__)
+        self.assertIsNot(foo.__class__, Dummy)
+
+    def test_apply_properties_different_properties_different_class(self):
+        helper = self._getTargetClass()
+        foo, bar = Dummy(), Dummy()
+        helper.apply_properties(foo, [helper.make_property(lambda _: 1, 'x')])
+        helper.apply_properties(bar, [helper.make_property(lambda _: 2, 'x')])
+        self.assertIsNot(foo.__class__, bar.__class__)
+        self.assertEqual(foo.x, 1)
+        self.assertEqual(bar.x, 2)
+
+
+class TestSettableProperty(unittest.TestCase):
+    def _makeOne(self, wrapped):
+        from pyramid.util import SettableProperty
+
+        return SettableProperty(wrapped)
+
+    def test_ctor(self):
+        import inspect
+
+        def worker(obj):
+            """doc"""
+
+        worker.extra = 'extra'
+        prop = self._makeOne(worker)
+        self.assertIs(prop.wrapped, worker)
+        self.assertEqual(prop.__doc__, 'doc')
+        self.assertIs(inspect.unwrap(prop), worker)
+        self.assertFalse(hasattr(prop, 'extra'))
+
 
 class Test_InstancePropertyMixin(unittest.TestCase):
     def _makeOne(self):
@@ -391,6 +476,17 @@ class Test_WeakOrderedSet(unittest.TestCase):
         self.assertTrue(reg in wos)
         self.assertEqual(wos.last, reg)
 
+    def test_add_existing_item_moves_to_end(self):
+        wos = self._makeOne()
+        reg1 = Dummy()
+        reg2 = Dummy()
+        wos.add(reg1)
+        wos.add(reg2)
+        wos.add(reg1)
+        self.assertEqual(len(wos), 2)
+        self.assertEqual(list(wos), [reg2, reg1])
+        self.assertEqual(wos.last, reg1)
+
     def test_weakref_removal(self):
         wos = self._makeOne()
         reg = Dummy()
@@ -400,6 +496,50 @@ class Test_WeakOrderedSet(unittest.TestCase):
         self.assertEqual(list(wos), [])
         self.assertEqual(wos.last, None)
 
+    def test_item_garbage_collected(self):
+        wos = self._makeOne()
+        reg = Dummy()
+        reg2 = Dummy()
+        wos.add(reg)
+        wos.add(reg2)
+        del reg2
+        self.assertEqual(len(wos), 1)
+        self.assertEqual(list(wos), [reg])
+        self.assertEqual(wos.last, reg)
+
+    def test_item_garbage_collected_after_empty(self):
+        wos = self._makeOne()
+        reg = Dummy()
+        wos.add(reg)
+        wos.empty()
+        reg2 = Dummy()
+        wos.add(reg2)
+        del reg
+        self.assertEqual(list(wos), [reg2])
+
+    def test_not_kept_alive_by_items(self):
+        import weakref
+
+        wos = self._makeOne()
+        reg = Dummy()
+        wos.add(reg)
+        ref = weakref.ref(wos)
+        del wos
+        self.assertIsNone(ref())
+
+    def test_remove_drops_weakref(self):
+        import weakref
+
+        wos = self._makeOne()
+        reg = Dummy()
+        for _ in range(3):
+            wos.add(reg)
+            wos.remove(reg)
+        self.assertEqual(weakref.getweakrefcount(reg), 0)
+        wos.add(reg)
+        wos.empty()
+        self.assertEqual(weakref.getweakrefcount(reg), 0)
+
     def test_last_updated(self):
         wos = self._makeOne()
         reg = Dummy()
@@ -456,6 +596,17 @@ class Test_object_description(unittest.TestCase):
     def test_string(self):
         self.assertEqual(self._callFUT('abc'), 'abc')
 
+    def test_string_subclass(self):
+        class Str(str):
+            pass
+
+        self.assertEqual(self._callFUT(Str('abc')), 'abc')
+
+    def test_dict_subclass(self):
+        from collections import OrderedDict
+
+        self.assertEqual(self._callFUT(OrderedDict()), 'OrderedDict()')
+
     def test_int(self):
         self.assertEqual(self._callFUT(1), '1')
 
@@ -565,6 +716,46 @@ class TestTopologicalSorter(unittest.TestCase):
             sorter.order, [('name', LAST), ('name2', LAST), ('name3', 'name2')]
         )
 
+    def test_remove_keeps_arc_added_by_other_node(self):
+        sorter = self._makeOne()
+        sorter.add('a', 'a', before='b')
+        sorter.add('b', 'b', after='a')
+        self.assertEqual(sorter.order, [('a', 'b')] * 2)
+        sorter.remove('a')
+        self.assertEqual(sorter.order, [('a', 'b')])
+        sorter.add('a', 'a')
+        self.assertEqual(sorter.sorted(), [('a', 'a'), ('b', 'b')])
+
+    def test_sorted_cached_until_changed(self):
+        from pyramid.util import TopologicalSorter
+
+        class DummySorter(TopologicalSorter):
+            sorts = 0
+
+            def _sort(self):
+                DummySorter.sorts += 1
+                return TopologicalSorter._sort(self)
+
+        sorter = DummySorter()
+        sorter.add('name1', 'factory1')
+        first = sorter.sorted()
+        self.assertEqual(first, [('name1', 'factory1')])
+        first.append('mutated')
+        self.assertEqual(sorter.sorted(), [('name1', 'factory1')])
+        self.assertEqual(DummySorter.sorts, 1)
+        sorter.add('name2', 'factory2')
+        self.assertEqual(
+            sorter.sorted(), [('name1', 'factory1'), ('name2', 'factory2')]
+        )
+        self.assertEqual(DummySorter.sorts, 2)
+        sorter.remove('name2')
+        self.assertEqual(sorter.sorted(), [('name1', 'factory1')])
+        self.assertEqual(DummySorter.sorts, 3)
+
+    def test_slots(self):
+        sorter = self._makeOne()
+        self.assertFalse(hasattr(sorter, '__dict__'))
+
     def test_sorted_ordering_1(self):
         sorter = self._makeOne()
         sorter.add('name1', 'factory1')
@@ -809,6 +1000,141 @@ class TestSentinel(unittest.TestCase):
         self.assertEqual(r, 'ABC')
 
 
+class Test_is_nonstr_iter(unittest.TestCase):
+    def _callFUT(self, v):
+        from pyramid.util import is_nonstr_iter
+
+        return is_nonstr_iter(v)
+
+    def test_it(self):
+        class Str(str):
+            pass
+
+        class NotIterable:
+            __iter__ = None
+
+        self.assertFalse(self._callFUT('abc'))
+        self.assertFalse(self._callFUT(Str('abc')))
+        self.assertFalse(self._callFUT(1))
+        self.assertFalse(self._callFUT(NotIterable()))
+        self.assertTrue(self._callFUT(['abc']))
+        self.assertTrue(self._callFUT(('abc',)))
+        self.assertTrue(self._callFUT({'abc': 1}))
+        self.assertTrue(self._callFUT(b'abc'))
+
+
+class Test_is_string_or_iterable(unittest.TestCase):
+    def _callFUT(self, v):
+        from pyramid.util import is_string_or_iterable
+
+        return is_string_or_iterable(v)
+
+    def test_it(self):
+        self.assertIs(self._callFUT('abc'), True)
+        self.assertIs(self._callFUT(['abc']), True)
+        self.assertIs(self._callFUT(1), False)
+        self.assertIs(self._callFUT(None), False)
+
+
+class Test_as_sorted_tuple(unittest.TestCase):
+    def _callFUT(self, val):
+        from pyramid.util import as_sorted_tuple
+
+        return as_sorted_tuple(val)
+
+    def test_single_value(self):
+        self.assertEqual(self._callFUT('GET'), ('GET',))
+        self.assertEqual(self._callFUT(None), (None,))
+
+    def test_small_sequences(self):
+        import itertools
+
+        self.assertEqual(self._callFUT([]), ())
+        self.assertEqual(self._callFUT(['a']), ('a',))
+        for n in (2, 3, 4):
+            for perm in itertools.permutations(range(n)):
+                self.assertEqual(self._callFUT(perm), tuple(range(n)))
+        self.assertEqual(self._callFUT(['b', 'a', 'b']), ('a', 'b', 'b'))
+
+    def test_stable(self):
+        class Item:
+            def __init__(self, key):
+                self.key = key
+
+            def __lt__(self, other):
+                return self.key < other.key
+
+        for n in (2, 3, 5):
+            items = [Item(1) for i in range(n)]
+            self.assertEqual(self._callFUT(items), tuple(items))
+
+    def test_iterator(self):
+        self.assertEqual(self._callFUT(iter(['b', 'a'])), ('a', 'b'))
+
+
+class Test_text_(unittest.TestCase):
+    def test_bytes(self):
+        self.assertEqual(text_(b'abc\xff'), 'abc\xff')
+        self.assertEqual(text_(b'\xc3\xa9', 'utf-8'), '\xe9')
+
+    def test_bytes_subclass(self):
+        class Bytes(bytes):
+            pass
+
+        self.assertEqual(text_(Bytes(b'abc')), 'abc')
+
+    def test_str(self):
+        s = 'abc'
+        self.assertIs(text_(s), s)
+
+
+class Test_bytes_(unittest.TestCase):
+    def test_str(self):
+        self.assertEqual(bytes_('abc\xff'), b'abc\xff')
+        self.assertEqual(bytes_('\xe9', 'utf-8'), b'\xc3\xa9')
+
+    def test_str_subclass(self):
+        class Str(str):
+            pass
+
+        self.assertEqual(bytes_(Str('abc')), b'abc')
+
+    def test_bytes(self):
+        b = b'abc'
+        self.assertIs(bytes_(b), b)
+
+
+class Test_ascii_(unittest.TestCase):
+    def _callFUT(self, s):
+        from pyramid.util import ascii_
+
+        return ascii_(s)
+
+    def test_ascii_str(self):
+        s = 'abc'
+        self.assertIs(self._callFUT(s), s)
+
+    def test_str_subclass(self):
+        class Str(str):
+            pass
+
+        result = self._callFUT(Str('abc'))
+        self.assertEqual(result, 'abc')
+        self.assertIs(result.__class__, str)
+
+    def test_non_ascii_str(self):
+        self.assertRaises(UnicodeEncodeError, self._callFUT, '\xe9')
+
+    def test_bytes(self):
+        self.assertEqual(self._callFUT(b'abc'), 'abc')
+
+    def test_non_ascii_bytes(self):
+        self.assertRaises(UnicodeDecodeError, self._callFUT, b'\xc3\xa9')
+
+    def test_bytearray(self):
+        self.assertEqual(self._callFUT(bytearray(b'abc')), 'abc')
+
+
 class TestCallableName(unittest.TestCase):
     def _callFUT(self, val):
         from pyramid.util import get_callable_name
@@ -831,6 +1157,10 @@ class TestCallableName(unittest.TestCase):
         name = b'La Pe\xc3\xb1a'
         self.assertRaises(ConfigurationError, self._callFUT, name)
 
+    def test_ascii_string_returned_unchanged(self):
+        name = 'hello_world'
+        self.assertIs(self._callFUT(name), name)
+
 
 class Test_hide_attrs(unittest.TestCase):
     def _callFUT(self, obj, *attrs):
@@ -891,6 +1221,16 @@ class Test_hide_attrs(unittest.TestCase):
             pass
         self.assertTrue('foo' not in obj.__dict__)
 
+    def test_deletes_multiple_attrs(self):
+        obj = self._makeDummy()
+        obj.bar = 'asdf'
+        with self._callFUT(obj, 'foo', 'bar', 'baz'):
+            self.assertTrue('bar' not in obj.__dict__)
+            obj.foo = object()
+        self.assertTrue('foo' not in obj.__dict__)
+        self.assertTrue('baz' not in obj.__dict__)
+        self.assertEqual(obj.bar, 'asdf')
+
 
 def dummyfunc():  # pragma: no cover
     pass
@@ -921,6 +1261,33 @@ class Test_is_same_domain(unittest.TestCase):
         self.assertFalse(self._callFUT("example.com:8080", "example.com"))
         self.assertFalse(self._callFUT("example.com", "example.com:8080"))
 
+    def test_pattern_case_insensitive(self):
+        self.assertTrue(self._callFUT("example.com", "Example.COM"))
+        self.assertTrue(self._callFUT("foo.example.com", ".Example.com"))
+
+
+class Test_compile_domain_pattern(unittest.TestCase):
+    def _callFUT(self, *args, **kw):
+        from pyramid.util import compile_domain_pattern
+
+        return compile_domain_pattern(*args, **kw)
+
+    def test_cached(self):
+        self.assertIs(
+            self._callFUT(".example.com"), self._callFUT(".example.com")
+        )
+
+    def test_empty(self):
+        self.assertFalse(self._callFUT("")("example.com"))
+        self.assertFalse(self._callFUT(None)("example.com"))
+
+    def test_wildcard(self):
+        matcher = self._callFUT(".example.com")
+        self.assertTrue(matcher("example.com"))
+        self.assertTrue(matcher("foo.example.com"))
+        self.assertTrue(matcher(".example.com"))
+        self.assertFalse(matcher("fooexample.com"))
+
 
 class Test_make_contextmanager(unittest.TestCase):
     def _callFUT(self, *args, **kw):
@@ -964,6 +1331,40 @@ class Test_make_contextmanager(unittest.TestCase):
             self.assertEqual(ctx, 'a')
 
 
+class Test__getfullargspec(unittest.TestCase):
+    def _callFUT(self, fn):
+        from pyramid.util import _getfullargspec
+
+        return _getfullargspec(fn)
+
+    def test_function_cached(self):
+        from pyramid.util import _argspec_cache
+
+        def foo(request):
+            """ """
+
+        spec = self._callFUT(foo)
+        self.assertEqual(spec.args, ['request'])
+        self.assertIs(_argspec_cache[foo], spec)
+        self.assertIs(self._callFUT(foo), spec)
+
+    def test_bound_method_cached_on_function(self):
+        from pyramid.util import _argspec_cache
+
+        class Foo:
+            def method(self, request):
+                """ """
+
+        foo = Foo()
+        spec = self._callFUT(foo.method)
+        self.assertEqual(spec.args, ['self', 'request'])
+        self.assertIs(_argspec_cache[Foo.method], spec)
+
+    def test_not_weakrefable(self):
+        spec = self._callFUT(object().__init__)
+        self.assertEqual(spec.varargs, 'args')
+
+
 class Test_takes_one_arg(unittest.TestCase):
     def _callFUT(self, view, attr=None, argname=None):
         from pyramid.util import takes_one_arg